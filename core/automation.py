@@ -28,7 +28,7 @@ def perform_click_action(
             pass
 
     send_click()
-    if click_lock.locked():
+    if click_lock is not None and click_lock.locked():
         click_lock.release()
 
 
@@ -247,6 +247,9 @@ class AutomationManager:
         self.sell_button_position = None
         self.sell_count = 0
         self.is_selling = False
+        # Cleared by whoever starts a sell, set when perform_auto_sell returns.
+        self.sell_done_event = threading.Event()
+        self.sell_done_event.set()
         self.is_walking = False
         self.current_status = "STOPPED"
 
@@ -1140,15 +1143,18 @@ class AutomationManager:
         return False
 
     def perform_auto_sell(self):
-        auto_sell_method = self.dig_tool.get_param("auto_sell_method")
-        
-        if auto_sell_method == "button_click":
-            return self._perform_auto_sell_button_click()
-        elif auto_sell_method == "ui_navigation":
-            return self._perform_auto_sell_ui_navigation()
-        else:
-            logger.error(f"Unknown auto_sell_method: {auto_sell_method}")
-            return False
+        try:
+            auto_sell_method = self.dig_tool.get_param("auto_sell_method")
+
+            if auto_sell_method == "button_click":
+                return self._perform_auto_sell_button_click()
+            elif auto_sell_method == "ui_navigation":
+                return self._perform_auto_sell_ui_navigation()
+            else:
+                logger.error(f"Unknown auto_sell_method: {auto_sell_method}")
+                return False
+        finally:
+            self.sell_done_event.set()
 
     def _perform_auto_sell_button_click(self):
         try:
@@ -2,6 +2,13 @@ import numpy as np
 import collections
 import cv2
 
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 def detect_by_saturation(hsv, saturation_threshold):
     saturation = hsv[:, :, 1]
@@ -10,7 +17,7 @@ def detect_by_saturation(hsv, saturation_threshold):
 
 
 def detect_by_otsu_with_area_filter(
-    hsv, min_area=50, max_area=None, morph_kernel_size=3
+    hsv, min_area=50, max_area=None, morph_kernel_size=3, use_umat=False, dst=None
 ):
     """
     Alternative detection method using Otsu's thresholding with area filtering.
@@ -20,16 +27,24 @@ def detect_by_otsu_with_area_filter(
         min_area: Minimum contour area to keep (default: 50)
         max_area: Maximum contour area to keep (None for no upper limit)
         morph_kernel_size: Size of morphological operations kernel (default: 3)
+        use_umat: Run threshold and morphology on cv2.UMat (OpenCL) (default: False)
+        dst: Optional preallocated uint8 mask to write the result into
 
     Returns:
         Binary mask with detected regions
     """
     # Extract saturation channel
     saturation = hsv[:, :, 1]
+    if use_umat:
+        saturation = cv2.UMat(np.ascontiguousarray(saturation))
 
     # Apply Otsu's thresholding
     threshold_value, otsu_mask = cv2.threshold(
-        saturation, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+        saturation,
+        0,
+        255,
+        cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+        dst=None if use_umat else dst,
     )
 
     # Optional: Apply morphological operations to clean up the mask
@@ -38,9 +53,12 @@ def detect_by_otsu_with_area_filter(
             cv2.MORPH_ELLIPSE, (morph_kernel_size, morph_kernel_size)
         )
         # Close small gaps
-        otsu_mask = cv2.morphologyEx(otsu_mask, cv2.MORPH_CLOSE, kernel)
+        otsu_mask = cv2.morphologyEx(otsu_mask, cv2.MORPH_CLOSE, kernel, dst=otsu_mask)
         # Remove small noise
-        otsu_mask = cv2.morphologyEx(otsu_mask, cv2.MORPH_OPEN, kernel)
+        otsu_mask = cv2.morphologyEx(otsu_mask, cv2.MORPH_OPEN, kernel, dst=otsu_mask)
+
+    if use_umat:
+        otsu_mask = otsu_mask.get()
 
     # Apply area filtering
     if min_area > 0 or max_area is not None:
@@ -49,8 +67,9 @@ def detect_by_otsu_with_area_filter(
             otsu_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
         )
 
-        # Create a new mask for filtered contours
-        filtered_mask = np.zeros_like(otsu_mask)
+        # Contours are already extracted, so the mask can be cleared and reused
+        filtered_mask = otsu_mask
+        filtered_mask.fill(0)
 
         for contour in contours:
             area = cv2.contourArea(contour)
@@ -66,7 +85,9 @@ def detect_by_otsu_with_area_filter(
     return otsu_mask, threshold_value
 
 
-def detect_by_otsu_adaptive_area(hsv, area_percentile=0.1, morph_kernel_size=3):
+def detect_by_otsu_adaptive_area(
+    hsv, area_percentile=0.1, morph_kernel_size=3, use_umat=False, dst=None
+):
     """
     Otsu detection with adaptive area filtering based on image size.
 
@@ -74,6 +95,8 @@ def detect_by_otsu_adaptive_area(hsv, area_percentile=0.1, morph_kernel_size=3):
         hsv: HSV image array
         area_percentile: Minimum area as percentage of image size (default: 0.1%)
         morph_kernel_size: Size of morphological operations kernel
+        use_umat: Run threshold and morphology on cv2.UMat (OpenCL) (default: False)
+        dst: Optional preallocated uint8 mask to write the result into
 
     Returns:
         Binary mask with detected regions and threshold value
@@ -83,7 +106,11 @@ def detect_by_otsu_adaptive_area(hsv, area_percentile=0.1, morph_kernel_size=3):
     min_area = int(image_area * (area_percentile / 100.0))
 
     return detect_by_otsu_with_area_filter(
-        hsv, min_area=min_area, morph_kernel_size=morph_kernel_size
+        hsv,
+        min_area=min_area,
+        morph_kernel_size=morph_kernel_size,
+        use_umat=use_umat,
+        dst=dst,
     )
 
 
@@ -115,6 +142,34 @@ def get_hsv_bounds(hsv_color, is_low_sat):
     return lower_bound, upper_bound
 
 
+def locked_color_detection_info(locked_color_hex, lower_bound, upper_bound):
+    """Detection info reported while tracking a locked colour.
+
+    Locked frames bypass the configured detector, so describe the inRange
+    window that is actually producing the mask.
+    """
+    return {
+        "method": "Locked Color",
+        "threshold": (
+            f"H:{lower_bound[0]}-{upper_bound[0]} "
+            f"S:{lower_bound[1]}-{upper_bound[1]} "
+            f"V:{lower_bound[2]}-{upper_bound[2]}"
+        ),
+        "target_color": locked_color_hex,
+    }
+
+
+def double_structuring_element(kernel, anchor=(-1, -1)):
+    """Return ``(doubled, anchor)`` so one pass equals two passes with ``kernel``."""
+    k_h, k_w = kernel.shape
+    a_x = k_w // 2 if anchor[0] < 0 else anchor[0]
+    a_y = k_h // 2 if anchor[1] < 0 else anchor[1]
+    doubled = np.zeros((2 * k_h - 1, 2 * k_w - 1), dtype=np.uint8)
+    for y, x in zip(*np.nonzero(kernel)):
+        doubled[y : y + k_h, x : x + k_w] |= kernel
+    return doubled, (2 * a_x, 2 * a_y)
+
+
 def apply_line_exclusion(mask, cursor_pos, game_area, line_exclusion_radius):
     if line_exclusion_radius <= 0:
         return mask
@@ -136,6 +191,115 @@ def apply_line_exclusion(mask, cursor_pos, game_area, line_exclusion_radius):
     return mask
 
 
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def line_movement_range(history, count):
+        min_pos = 2**31 - 1
+        max_pos = -(2**31)
+        valid_count = 0
+        for i in range(count):
+            pos = history[i]
+            if pos != -1:
+                if pos < min_pos:
+                    min_pos = pos
+                if pos > max_pos:
+                    max_pos = pos
+                valid_count += 1
+        if valid_count == 0:
+            return 0, 0
+        return valid_count, max_pos - min_pos
+
+else:
+
+    def line_movement_range(history, count):
+        valid_positions = history[:count]
+        valid_positions = valid_positions[valid_positions != -1]
+        if valid_positions.size == 0:
+            return 0, 0
+        return valid_positions.size, int(valid_positions.max() - valid_positions.min())
+
+
+# OpenCV's 8-bit BGR2HSV computes S as diff * round((255 << 12) / max) with a
+# rounding shift; mirror its table so the fused kernel matches cvtColor exactly.
+_HSV_SHIFT = 12
+_SDIV_TABLE = np.array(
+    [0] + [int(round((255 << _HSV_SHIFT) / v)) for v in range(1, 256)],
+    dtype=np.int32,
+)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def saturation_threshold_mask(bgr, threshold, line_pos, exclusion_radius, out):
+        height, width = out.shape
+        use_exclusion = line_pos != -1 and exclusion_radius > 0
+        exclusion_start = line_pos - exclusion_radius
+        exclusion_end = line_pos + exclusion_radius
+        for y in prange(height):
+            for x in range(width):
+                if use_exclusion and exclusion_start <= x <= exclusion_end:
+                    out[y, x] = 0
+                    continue
+                b = np.int32(bgr[y, x, 0])
+                g = np.int32(bgr[y, x, 1])
+                r = np.int32(bgr[y, x, 2])
+                mx = max(b, g, r)
+                mn = min(b, g, r)
+                s = (
+                    (mx - mn) * _SDIV_TABLE[mx] + (1 << (_HSV_SHIFT - 1))
+                ) >> _HSV_SHIFT
+                out[y, x] = 255 if s > threshold else 0
+        return out
+
+else:
+
+    def saturation_threshold_mask(bgr, threshold, line_pos, exclusion_radius, out):
+        saturation = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)[:, :, 1]
+        cv2.threshold(saturation, threshold, 255, cv2.THRESH_BINARY, dst=out)
+        if line_pos != -1 and exclusion_radius > 0:
+            out[:, max(0, line_pos - exclusion_radius) : line_pos + exclusion_radius + 1] = 0
+        return out
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def fps_weighted_velocity(positions, timestamps, fps):
+        n = positions.shape[0]
+        velocities = np.empty(max(n - 1, 0), dtype=np.float64)
+        count = 0
+        for i in range(n - 1):
+            dt = timestamps[i + 1] - timestamps[i]
+            if dt > 1e-6:
+                velocities[count] = (positions[i + 1] - positions[i]) / dt
+                count += 1
+        if count == 0:
+            return 0.0
+        if count == 1:
+            return velocities[0]
+
+        kept = 0
+        for i in range(count):
+            if abs(velocities[i]) < 20000:
+                velocities[kept] = velocities[i]
+                kept += 1
+        if kept == 0:
+            # Nothing was compacted, so the unfiltered samples are intact.
+            kept = count
+
+        time_weight_factor = min(min(fps / 60.0, 2.0), 1.5)
+        step = time_weight_factor / (kept - 1) if kept > 1 else 0.0
+        weight_sum = 0.0
+        weighted = 0.0
+        for i in range(kept):
+            w = np.exp(-time_weight_factor + i * step)
+            weight_sum += w
+            weighted += velocities[i] * w
+        return weighted / weight_sum
+
+
 def find_line_position(
     gray_array, sensitivity_threshold=50, min_height_ratio=0.7, offset=0
 ):
@@ -227,6 +391,9 @@ class VelocityCalculator:
         positions = np.array([pos for pos, _ in points], dtype=np.float64)
         timestamps = np.array([t for _, t in points], dtype=np.float64)
 
+        if NUMBA_AVAILABLE:
+            return fps_weighted_velocity(positions, timestamps, self._fps)
+
         timestamps = timestamps - timestamps[0]
 
         pos_diffs = np.diff(positions)
@@ -475,7 +642,36 @@ def calculate_velocity_based_sweet_spot_width(
     return max(5.0, min(50.0, dynamic_width_percent))
 
 
-def detect_by_color_picker(hsv, target_color_hsv, color_tolerance=30, enable_detailed_logging=False):
+def build_sweet_spot_width_table(
+    base_width_percent,
+    enabled=True,
+    velocity_multiplier=1.5,
+    max_velocity_factor=500.0,
+    size=1024,
+):
+    """
+    Precompute calculate_velocity_based_sweet_spot_width over |velocity|.
+
+    Returns:
+        (table, scale) where the width for a velocity is
+        table[min(int(abs(velocity) * scale), size - 1)]
+    """
+    scale = (size - 1) / max_velocity_factor if max_velocity_factor > 0 else 0.0
+    step = max_velocity_factor / (size - 1)
+    table = [
+        calculate_velocity_based_sweet_spot_width(
+            base_width_percent,
+            i * step,
+            enabled=enabled,
+            velocity_multiplier=velocity_multiplier,
+            max_velocity_factor=max_velocity_factor,
+        )
+        for i in range(size)
+    ]
+    return table, scale
+
+
+def detect_by_color_picker(hsv, target_color_hsv, color_tolerance=30, enable_detailed_logging=False, dst=None):
     """
     Detection method using a user-picked color with tolerance.
 
@@ -484,6 +680,7 @@ def detect_by_color_picker(hsv, target_color_hsv, color_tolerance=30, enable_det
         target_color_hsv: Target color in HSV format [H, S, V]
         color_tolerance: Tolerance for color matching (default: 30)
         enable_detailed_logging: Whether to log detailed debug information (default: False)
+        dst: Optional preallocated uint8 mask to write the result into
 
     Returns:
         Binary mask with detected regions matching the target color
@@ -546,7 +743,7 @@ def detect_by_color_picker(hsv, target_color_hsv, color_tolerance=30, enable_det
                 ),
                 np.array([179, upper_bound[1], upper_bound[2]], dtype=np.uint8),
             )
-            mask = cv2.bitwise_or(mask1, mask2)
+            mask = cv2.bitwise_or(mask1, mask2, dst=dst)
             if enable_detailed_logging:
                 logger.debug("Applied hue wraparound (low)")
         elif target_color_hsv[0] + color_tolerance > 179:
@@ -567,19 +764,18 @@ def detect_by_color_picker(hsv, target_color_hsv, color_tolerance=30, enable_det
                     dtype=np.uint8,
                 ),
             )
-            mask = cv2.bitwise_or(mask1, mask2)
+            mask = cv2.bitwise_or(mask1, mask2, dst=dst)
             if enable_detailed_logging:
                 logger.debug("Applied hue wraparound (high)")
         else:
-            mask = cv2.inRange(hsv, lower_bound, upper_bound)
+            mask = cv2.inRange(hsv, lower_bound, upper_bound, dst=dst)
             if enable_detailed_logging:
                 logger.debug("Applied normal HSV range")
 
-        detected_pixels = np.sum(mask > 0)
-        total_pixels = mask.shape[0] * mask.shape[1]
-        detection_percent = (detected_pixels / total_pixels) * 100
-        
         if enable_detailed_logging:
+            detected_pixels = cv2.countNonZero(mask)
+            total_pixels = mask.shape[0] * mask.shape[1]
+            detection_percent = (detected_pixels / total_pixels) * 100
             logger.debug(f"Detection result: {detected_pixels}/{total_pixels} pixels ({detection_percent:.1f}%)")
         
         return mask
@@ -590,7 +786,7 @@ def detect_by_color_picker(hsv, target_color_hsv, color_tolerance=30, enable_det
         return np.zeros(hsv.shape[:2] if hsv is not None else (10, 10), dtype=np.uint8)
 
 
-def rgb_to_hsv_single(rgb_color):
+def rgb_to_hsv_single(rgb_color, dst=None):
     try:
         if isinstance(rgb_color, int):
             r = (rgb_color >> 16) & 0xFF
@@ -603,10 +799,12 @@ def rgb_to_hsv_single(rgb_color):
         g = max(0, min(255, int(g)))
         b = max(0, min(255, int(b)))
 
-        rgb_array = np.array([[[b, g, r]]], dtype=np.uint8)
-        hsv_array = cv2.cvtColor(rgb_array, cv2.COLOR_BGR2HSV)
+        if dst is None:
+            dst = np.empty((1, 1, 3), dtype=np.uint8)
+        dst[0, 0] = (r, g, b)
+        cv2.cvtColor(dst, cv2.COLOR_RGB2HSV, dst=dst)
 
-        return hsv_array[0, 0]
+        return dst[0, 0]
     
     except Exception as e:
         from utils.debug_logger import logger
@@ -32,9 +32,9 @@ except ImportError:
     DND_AVAILABLE = False
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
 import keyboard
-import queue
 
 from interface.components import GameOverlay, AutoWalkOverlay
 from interface.main_window import MainWindow
@@ -44,25 +44,81 @@ from utils.debug_logger import logger, save_debug_screenshot, log_click_debug
 from utils.screen_capture import ScreenCapture
 from core.detection import (
     find_line_position,
+    line_movement_range,
     VelocityCalculator,
     get_hsv_bounds,
-    calculate_velocity_based_sweet_spot_width,
+    locked_color_detection_info,
+    build_sweet_spot_width_table,
     detect_by_otsu_with_area_filter,
     detect_by_otsu_adaptive_area,
     detect_by_color_picker,
     rgb_to_hsv_single,
+    saturation_threshold_mask,
+    double_structuring_element,
+    NUMBA_AVAILABLE,
 )
 from core.automation import AutomationManager, perform_click_action
 from core.notifications import DiscordNotifier
 
 warnings.filterwarnings("ignore")
-check_display_scale()
+
+# The per-frame OpenCV calls run on small regions at a high rate, where a
+# full-width thread pool costs more in task dispatch than it saves. The best
+# count is workload-dependent; time cvtColor with cv2.getTickCount to tune.
+cv2.setNumThreads(2)
+cv2.setUseOptimized(True)
+
+LINE_ROW_STEP = 2
+
+UNKNOWN_DETECTION_INFO = {"method": "Unknown", "threshold": "N/A"}
+
+MAIN_LOOP_PARAMS = (
+    "auto_sell_enabled",
+    "auto_walk_enabled",
+    "color_tolerance",
+    "line_detection_offset",
+    "line_exclusion_radius",
+    "line_sensitivity",
+    "max_zone_width_percent",
+    "min_zone_height_percent",
+    "otsu_adaptive_area",
+    "otsu_area_percentile",
+    "otsu_max_area",
+    "otsu_min_area",
+    "otsu_morph_kernel_size",
+    "picked_color_rgb",
+    "post_click_blindness",
+    "prediction_confidence_threshold",
+    "prediction_enabled",
+    "saturation_threshold",
+    "screenshot_fps",
+    "sell_every_x_digs",
+    "sweet_spot_width_percent",
+    "target_fps",
+    "use_color_picker_detection",
+    "use_otsu_detection",
+    "velocity_based_width_enabled",
+    "velocity_max_factor",
+    "velocity_width_multiplier",
+    "walk_duration",
+    "zone_min_width",
+    "zone_smoothing_factor",
+)
 
 
 class DigTool:
     def __init__(self):
+        check_display_scale()
         logger.enable_logging_for_startup(30)
 
+        # Raise the Windows timer resolution to 1 ms so frame-pacing sleeps
+        # are not rounded up to the default 15.6 ms tick.
+        self._timer_period_set = False
+        try:
+            self._timer_period_set = ctypes.windll.winmm.timeBeginPeriod(1) == 0
+        except Exception:
+            pass
+
         if DND_AVAILABLE:
             self.root = TkinterDnD.Tk()
         else:
@@ -81,12 +137,23 @@ class DigTool:
         self.root.minsize(self.width, self.base_height)
 
         self.param_vars = {}
+        self._param_snapshot = {}
+        self._params_dirty = True
         self.keybind_vars = {}
         self.last_known_good_params = {}
         self.window_positions = {}
 
         self.game_area = None
         self.cursor_position = None
+        self.area_info_label = None
+        self.sell_info_label = None
+        self.cursor_info_label = None
+        self._measured_latency = None
+        self._cached_latency = None
+        self._latency_measurement_time = 0.0
+        # Set again when detection starts; until then the grace period is over.
+        self.startup_time = 0
+        self._startup_grace_ended = True
 
         self.settings_manager = SettingsManager(self)
 
@@ -107,7 +174,12 @@ class DigTool:
         self.root.after_idle(lambda: self._check_and_enable_buttons())
 
         set_dig_tool_instance(self)
-        self.root.after(500, self.perform_initial_latency_measurement)
+        self.root.after(
+            500,
+            lambda: threading.Thread(
+                target=self.perform_initial_latency_measurement, daemon=True
+            ).start(),
+        )
         self.running = False
         self.preview_active = True
         self.overlay = None
@@ -122,8 +194,8 @@ class DigTool:
         self.velocity_calculator = VelocityCalculator()
         self.blind_until = 0
         self.frames_since_last_zone_detection = 0
-        self.smoothed_zone_x = None
-        self.smoothed_zone_w = None
+        # Smoothed (x, w) of the detected zone, or None while no zone is held.
+        self._smoothed_zone = None
         self.is_color_locked = False
         self.locked_color_hsv = None
         self.locked_color_hex = None
@@ -132,53 +204,107 @@ class DigTool:
         self.debug_window = None
         self.preview_label = None
         self.debug_label = None
+        self._preview_photo = None
+        self._debug_photo = None
+        # Last known label sizes, written from <Configure> on the Tk thread and
+        # read by the detection thread to size frames before handing them over.
+        self._preview_size = None
+        self._debug_size = None
+        self._preview_visible = False
+        self._debug_visible = False
+        self._preview_min_interval = 1 / 30
+        self._last_preview_push = 0.0
+        self._preview_bufs = [None, None]
+        self._preview_buf_index = 0
         self.color_swatch_label = None
         self.detection_info_label = None
         self.velocity_info_label = None
         self.main_loop_thread = None
         self.hotkey_thread = None
-        self.results_queue = queue.Queue(maxsize=1)
+        self._shutdown_event = threading.Event()
+        self._latest_result = None
+        self._last_ui_strings = {}
+        self._result_ready = False
+        self._last_render_time = 0.0
+        self._gui_min_interval = 1 / 60
+        self._gui_poll_interval_ms = 16
+        self._gui_idle_poll_interval_ms = 50
+        # Polls without a new result before dropping to the idle interval.
+        self._gui_idle_ticks = 0
+        self._gui_idle_tick_limit = 5
         self.debug_dir = "debug_clicks"
         self.debug_log_path = os.path.join(self.debug_dir, "click_log.txt")
-
-        self._memory_cleanup_counter = 0
+        self._debug_log_thread = None
+
+        # The detection loop allocates few container objects per frame, so
+        # raise the gen-0 threshold instead of forcing periodic collections.
+        gc.set_threshold(50000, 100, 100)
+        self._line_detection_stats = {
+            "detected": 0,
+            "failed": 0,
+            "last_positions": [],
+        }
         self._cached_kernel = None
+        self._cached_kernel_doubled = None
+        self._cached_kernel_anchor = (-1, -1)
         self._cached_kernel_size = 0
 
         self.last_milestone_notification = 0
 
         self.target_engaged = False
-        self.line_moving_history = []
+        self.line_moving_history = np.full(256, -1, dtype=np.int32)
+        self._line_moving_index = 0
         self.base_line_movement_check_frames = 30
         self.min_movement_threshold = 50
 
-        self._kernel = np.ones((5, 15), np.uint8)
-        self._hsv_lower_bound_cache = None
-        self._hsv_upper_bound_cache = None
-        self._last_hsv_color = None
-        self._last_is_low_sat = None
+        # A 15x5 rect closed twice is the same as one close with a 29x9 rect.
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (29, 9))
+        self._use_umat = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+        # Bumped whenever a new colour is locked so the per-frame bounds
+        # lookup is a single integer compare.
+        self._locked_color_version = 0
+        self._locked_bounds_version = -1
+        self._locked_bounds = None
+        self._locked_detection_info = UNKNOWN_DETECTION_INFO
+        self._picker_cache = {
+            "key": None,
+            "hex": None,
+            "hsv": None,
+            "tolerance": 30,
+            "error": None,
+        }
+        self._hsv_pixel_buf = np.empty((1, 1, 3), dtype=np.uint8)
+        self._hsv_buf = None
+        self._hsv_s_view = None
+        self._raw_zone_buf = np.empty(2, dtype=np.float32)
+        self._mask_buf = None
+        self._morph_tmp = None
+        self._labels_buf = None
+
+        start_ns = time.perf_counter_ns()
 
-        self._current_time_cache = 0
-        self._current_time_ms_cache = 0
-        self._last_time_update = 0
-
-        self._click_thread_pool = []
         self._max_click_threads = 3
+        self._click_executor = ThreadPoolExecutor(
+            max_workers=self._max_click_threads + 1, thread_name_prefix="click"
+        )
+        self._pending_instant_clicks = []
+        self._action_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="dig-action"
+        )
 
         # Benchmarking
         self.report_interval = 1
-        self.frame_times = []
-        self.last_report_time = time.time()
-        self.last_frame_time = time.perf_counter()
+        # Streaming average of frame time in ns, roughly over the last 60 frames.
+        self._frame_time_ema = None
+        self._frame_time_alpha = 2 / (60 + 1)
+        self.last_report_time = start_ns
+        self.last_frame_time = start_ns
         self.benchmark_fps = 0
 
         self.main_window.create_ui()
 
-        if hasattr(self, "screen_grabber"):
-            pass
-
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-        self.root.after(50, self.update_gui_from_queue)
+        self.root.after(self._gui_poll_interval_ms, self.update_gui_from_queue)
 
     def open_custom_pattern_manager(self):
         if self.custom_pattern_window is None:
@@ -203,15 +329,8 @@ class DigTool:
         if self.autowalk_overlay and self.autowalk_overlay.visible:
             self.autowalk_overlay.update_path_visualization()
 
-        if self.autowalk_overlay and self.autowalk_overlay.visible:
-            self.autowalk_overlay.update_path_visualization()
-
     def on_walk_pattern_changed(self, *args):
-        if (
-            hasattr(self, "autowalk_overlay")
-            and self.autowalk_overlay
-            and self.autowalk_overlay.visible
-        ):
+        if self.autowalk_overlay and self.autowalk_overlay.visible:
             self.autowalk_overlay.update_pattern_name()
             self.autowalk_overlay.update_path_visualization()
 
@@ -220,29 +339,100 @@ class DigTool:
         )
 
     def check_line_movement(self, line_pos, target_fps):
-        line_movement_check_frames = max(
-            int(self.base_line_movement_check_frames * (target_fps / 120.0)), 10
+        line_movement_check_frames = min(
+            max(int(self.base_line_movement_check_frames * (target_fps / 120.0)), 10),
+            self.line_moving_history.size,
         )
 
-        self.line_moving_history.append(line_pos)
-
-        if len(self.line_moving_history) > line_movement_check_frames:
-            self.line_moving_history.pop(0)
+        self.line_moving_history[
+            self._line_moving_index % line_movement_check_frames
+        ] = line_pos
+        self._line_moving_index += 1
 
-        if len(self.line_moving_history) < 10:
+        history_len = min(self._line_moving_index, line_movement_check_frames)
+        if history_len < 10:
             return False
 
-        valid_positions = [pos for pos in self.line_moving_history if pos != -1]
+        valid_count, movement_range = line_movement_range(
+            self.line_moving_history, history_len
+        )
 
-        if len(valid_positions) < 5:
+        if valid_count < 5:
             return False
 
-        min_pos = min(valid_positions)
-        max_pos = max(valid_positions)
-        movement_range = max_pos - min_pos
-
         return movement_range >= self.min_movement_threshold
 
+    def _get_picker_target(self, picked_color, color_tolerance_param):
+        key = (picked_color, color_tolerance_param)
+        cache = self._picker_cache
+        if cache["key"] == key:
+            return cache
+
+        try:
+            if isinstance(color_tolerance_param, str):
+                color_tolerance = int(float(color_tolerance_param.strip())) if color_tolerance_param.strip() else 30
+            else:
+                color_tolerance = int(color_tolerance_param) if color_tolerance_param is not None else 30
+        except (ValueError, TypeError):
+            color_tolerance = 30
+
+        hex_color = picked_color.strip()
+        if hex_color.startswith("#"):
+            hex_color = hex_color[1:]
+        target_hsv, error = None, None
+        try:
+            if len(hex_color) != 6:
+                raise ValueError(f"Invalid hex color length: {len(hex_color)}")
+            target_hsv = rgb_to_hsv_single(
+                int(hex_color, 16), dst=self._hsv_pixel_buf
+            ).copy()
+        except (ValueError, TypeError) as e:
+            error = e
+
+        cache.update(
+            key=key,
+            hex=hex_color,
+            hsv=target_hsv,
+            tolerance=color_tolerance,
+            error=error,
+        )
+        return cache
+
+    @staticmethod
+    def _hsv_to_hex(h, s, v):
+        # Approximates cvtColor(HSV2BGR) on a uint8 pixel (H in 0-179). This
+        # runs in double precision while OpenCV uses float32 with cvRound, so
+        # a channel can differ by one step (about 0.2% of inputs). That is
+        # fine for a display swatch; nothing matches on this string.
+        h, s, v = int(h), int(s) / 255.0, int(v) / 255.0
+        sector_pos = (h * 2 % 360) / 60.0
+        c = v * s
+        x = c * (1 - abs(sector_pos % 2 - 1))
+        m = v - c
+        r, g, b = (
+            (c, x, 0),
+            (x, c, 0),
+            (0, c, x),
+            (0, x, c),
+            (x, 0, c),
+            (c, 0, x),
+        )[int(sector_pos)]
+        return "#{:02x}{:02x}{:02x}".format(
+            int((r + m) * 255 + 0.5), int((g + m) * 255 + 0.5), int((b + m) * 255 + 0.5)
+        )
+
+    def _get_locked_hsv_bounds(self):
+        if self._locked_bounds_version == self._locked_color_version:
+            return self._locked_bounds
+        self._locked_bounds = get_hsv_bounds(
+            self.locked_color_hsv, self.is_low_sat_lock
+        )
+        self._locked_detection_info = locked_color_detection_info(
+            self.locked_color_hex, *self._locked_bounds
+        )
+        self._locked_bounds_version = self._locked_color_version
+        return self._locked_bounds
+
     def check_target_engagement(self, line_pos, target_fps):
         line_detected = line_pos != -1
         line_moving = self.check_line_movement(line_pos, target_fps)
@@ -250,21 +440,18 @@ class DigTool:
         return line_detected and line_moving
 
     def measure_system_latency(self):
-        if hasattr(self, "_measured_latency") and hasattr(
-            self, "_latency_measurement_time"
-        ):
-            if time.time() - self._latency_measurement_time < 30:
+        if self._measured_latency is not None:
+            if time.monotonic() - self._latency_measurement_time < 30:
                 return self._measured_latency
               
         game_area = getattr(self, "game_area", None)
         self._measured_latency = measure_system_latency(game_area, self.cam)
 
-        self._latency_measurement_time = time.time()
+        self._latency_measurement_time = time.monotonic()
         return self._measured_latency
 
     def force_latency_remeasurement(self):
-        if hasattr(self, "_latency_measurement_time"):
-            self._latency_measurement_time = 0
+        self._latency_measurement_time = 0.0
 
         new_latency = self.measure_system_latency()
         self._cached_latency = new_latency
@@ -285,16 +472,17 @@ class DigTool:
 
         if self.running:
             try:
-                webhook_url = self.param_vars.get("webhook_url", tk.StringVar()).get()
-                user_id = self.param_vars.get("user_id", tk.StringVar()).get()
+                webhook_url = self._get_param_var_value("webhook_url")
+                user_id = self._get_param_var_value("user_id")
                 if webhook_url:
                     self.discord_notifier.set_webhook_url(webhook_url)
-                    threading.Thread(target=self.discord_notifier.send_shutdown_notification, args=(user_id if user_id else None), daemon=True).start()
+                    threading.Thread(target=self.discord_notifier.send_shutdown_notification, args=(user_id or None,), daemon=True).start()
             except:
                 pass
 
         self.preview_active = False
         self.running = False
+        self._shutdown_event.set()
         self.root.protocol("WM_DELETE_WINDOW", lambda: None)
         self.update_status("Shutting down...")
         self.root.after(100, self._check_shutdown)
@@ -316,11 +504,21 @@ class DigTool:
             self.autowalk_overlay.destroy_overlay()
             self.autowalk_overlay = None
 
+        if self._timer_period_set:
+            try:
+                ctypes.windll.winmm.timeEndPeriod(1)
+            except Exception:
+                pass
+            self._timer_period_set = False
+
         if hasattr(self, "automation_manager") and self.automation_manager:
             self.automation_manager.cleanup()
             del self.automation_manager
             self.automation_manager = None
 
+        self._click_executor.shutdown(wait=False, cancel_futures=True)
+        self._action_executor.shutdown(wait=False, cancel_futures=True)
+
         try:
             keyboard.unhook_all()
         except:
@@ -331,8 +529,7 @@ class DigTool:
         except:
             pass
 
-        for _ in range(3):
-            gc.collect()
+        gc.collect()
 
         try:
             import comtypes
@@ -403,16 +600,13 @@ class DigTool:
                 if attempt < max_retries - 1:
                     time.sleep(1)
 
-        while self.preview_active:
-            time.sleep(0.5)
+        self._shutdown_event.wait()
 
         logger.info("Hotkey listener thread ended")
 
     def apply_keybinds(self):
         logger.info("Applying keybinds...")
 
-        time.sleep(0.1)
-
         try:
             keyboard.unhook_all()
             logger.debug("Previous hotkeys unhooked")
@@ -538,9 +732,14 @@ class DigTool:
             logger.error(f"Error toggling auto walk overlay: {e}")
 
     def get_param(self, key):
+        try:
+            return self._param_snapshot[key]
+        except KeyError:
+            pass
+
         if key == "system_latency":
             return self.get_cached_system_latency()
-        
+
         if key in self.param_vars:
             try:
                 value = self.param_vars[key].get()
@@ -556,6 +755,10 @@ class DigTool:
                     return default_value
         return getattr(self, key, None)
 
+    def _get_param_var_value(self, key, default=""):
+        var = self.param_vars.get(key)
+        return var.get() if var is not None else default
+
     def set_param(self, key, value):
         if key in self.param_vars:
             try:
@@ -610,7 +813,7 @@ class DigTool:
         self.root.geometry(f"{self.width}x{new_height}")
 
     def update_area_info(self):
-        if not hasattr(self, "area_info_label"):
+        if self.area_info_label is None:
             return
         if self.game_area:
             x1, y1, x2, y2 = self.game_area
@@ -621,7 +824,7 @@ class DigTool:
         self.area_info_label.config(text=area_text)
 
     def update_sell_info(self):
-        if not hasattr(self, "sell_info_label"):
+        if self.sell_info_label is None:
             return
         if self.automation_manager.sell_button_position:
             x, y = self.automation_manager.sell_button_position
@@ -631,9 +834,9 @@ class DigTool:
         self.sell_info_label.config(text=sell_text)
 
     def update_cursor_info(self):
-        if not hasattr(self, "cursor_info_label"):
+        if self.cursor_info_label is None:
             return
-        if hasattr(self, "cursor_position") and self.cursor_position:
+        if self.cursor_position:
             x, y = self.cursor_position
             cursor_text = f"Cursor Position: Set at ({x}, {y})"
         else:
@@ -691,6 +894,16 @@ class DigTool:
             lambda: self.settings_manager.auto_save_setting("coordinates")
         )
 
+    def _allocate_zone_buffers(self, width, height):
+        # Detection thread only: it reallocates when the zone shape changes
+        # and reads the buffers into locals for the rest of the frame.
+        zone_height = int(height * 0.80)
+        self._hsv_buf = np.empty((zone_height, width, 3), dtype=np.uint8)
+        self._hsv_s_view = self._hsv_buf[:, :, 1]
+        self._mask_buf = np.empty((zone_height, width), dtype=np.uint8)
+        self._morph_tmp = np.empty((zone_height, width), dtype=np.uint8)
+        self._labels_buf = np.empty((zone_height, width), dtype=np.int32)
+
     def start_sell_button_selection(self):
         self.root.iconify()
         self.sell_selection_overlay = tk.Toplevel()
@@ -766,9 +979,9 @@ class DigTool:
 
     def test_discord_ping(self):
         try:
-            webhook_url = self.param_vars.get('webhook_url', tk.StringVar()).get()
-            include_screenshot = self.param_vars.get('include_screenshot_in_discord', tk.BooleanVar()).get()
-            user_id = self.param_vars.get('user_id', tk.StringVar()).get()
+            webhook_url = self._get_param_var_value("webhook_url")
+            include_screenshot = self._get_param_var_value("include_screenshot_in_discord", False)
+            user_id = self._get_param_var_value("user_id")
 
             if not webhook_url:
                 self.update_status("Webhook URL not set!")
@@ -790,10 +1003,10 @@ class DigTool:
 
     def check_milestone_notifications(self):
         try:
-            webhook_url = self.param_vars.get('webhook_url', tk.StringVar()).get()
-            include_screenshot = self.param_vars.get('include_screenshot_in_discord', tk.BooleanVar()).get()
-            user_id = self.param_vars.get('user_id', tk.StringVar()).get()
-            milestone_interval = self.param_vars.get('milestone_interval', tk.IntVar()).get()
+            webhook_url = self._get_param_var_value("webhook_url")
+            include_screenshot = self._get_param_var_value("include_screenshot_in_discord", False)
+            user_id = self._get_param_var_value("user_id")
+            milestone_interval = self._get_param_var_value("milestone_interval", 0)
 
             if not webhook_url or milestone_interval <= 0:
                 return
@@ -845,6 +1058,10 @@ class DigTool:
 
             self.preview_label = Label(self.preview_window, bg="black")
             self.preview_label.pack(fill=tk.BOTH, expand=True)
+            self.preview_label.bind(
+                "<Configure>",
+                lambda e: setattr(self, "_preview_size", (e.width, e.height)),
+            )
 
             velocity_frame = Frame(self.preview_window, bg="black", pady=5)
             self.velocity_info_label = Label(
@@ -858,12 +1075,16 @@ class DigTool:
             self.velocity_info_label.pack(expand=True)
             velocity_frame.pack(fill="x")
 
+            self._bind_visibility(self.preview_window, "_preview_visible")
             self.preview_window.protocol("WM_DELETE_WINDOW", self.toggle_preview_window)
             self.toggle_preview_on_top()
         else:
             self.preview_window.destroy()
             self.preview_window = None
             self.preview_label = None
+            self._preview_photo = None
+            self._preview_size = None
+            self._preview_visible = False
             self.velocity_info_label = None
 
     def toggle_debug_window(self):
@@ -881,6 +1102,10 @@ class DigTool:
 
             self.debug_label = Label(self.debug_window, bg="black")
             self.debug_label.pack(fill=tk.BOTH, expand=True)
+            self.debug_label.bind(
+                "<Configure>",
+                lambda e: setattr(self, "_debug_size", (e.width, e.height)),
+            )
 
             color_frame = Frame(self.debug_window, bg="black", pady=5)
             Label(
@@ -915,36 +1140,131 @@ class DigTool:
             self.detection_info_label.pack(anchor="w", padx=10)
             detection_frame.pack(fill="x")
 
+            self._bind_visibility(self.debug_window, "_debug_visible")
             self.debug_window.protocol("WM_DELETE_WINDOW", self.toggle_debug_window)
             self.toggle_debug_on_top()
         else:
             self.debug_window.destroy()
             self.debug_window = None
             self.debug_label = None
+            self._debug_photo = None
+            self._debug_size = None
+            self._debug_visible = False
             self.color_swatch_label = None
             self.detection_info_label = None
 
     def show_debug_console(self):
         logger.show_console()
 
+    def _config_if_changed(self, widget, **options):
+        for option, value in options.items():
+            key = (str(widget), option)
+            if self._last_ui_strings.get(key) != value:
+                widget.config(**{option: value})
+                self._last_ui_strings[key] = value
+
     def update_gui_from_queue(self):
+        # The detection thread only fills the slot and raises the flag; it
+        # never calls into Tk, so a busy GUI cannot stall detection.
+        if self._result_ready:
+            self._result_ready = False
+            self._gui_idle_ticks = 0
+            self._render_latest_result()
+        else:
+            self._gui_idle_ticks += 1
+        if not self.preview_active:
+            return
+        # Poll fast only while results keep arriving for a visible consumer.
+        results_arriving = (
+            self._gui_idle_ticks < self._gui_idle_tick_limit
+            and self._has_frame_consumers()
+        )
+        interval = (
+            self._gui_poll_interval_ms
+            if results_arriving
+            else self._gui_idle_poll_interval_ms
+        )
+        self.root.after(interval, self.update_gui_from_queue)
+
+    def _bind_visibility(self, window, flag):
+        # Tracked from Map/Unmap so the detection thread never has to query
+        # Tk for whether anyone can see its frames.
+        def on_change(event, visible):
+            if event.widget is window:
+                setattr(self, flag, visible)
+
+        window.bind("<Map>", lambda e: on_change(e, True), add="+")
+        window.bind("<Unmap>", lambda e: on_change(e, False), add="+")
+        setattr(self, flag, True)
+
+    def _has_frame_consumers(self):
+        return (
+            self._preview_visible
+            or self._debug_visible
+            or (self.overlay_enabled and self.overlay is not None)
+            or (self.autowalk_overlay_enabled and self.autowalk_overlay is not None)
+        )
+
+    def _next_preview_buffers(self, shape):
+        # Alternate between two buffer pairs so the frame being built never
+        # aliases the one the GUI thread may still be pasting.
+        self._preview_buf_index ^= 1
+        buffers = self._preview_bufs[self._preview_buf_index]
+        if buffers is None or buffers[0].shape != shape:
+            h, w = shape[:2]
+            buffers = (
+                np.empty(shape, dtype=np.uint8),
+                np.empty((int(150 * h / w), 150) + shape[2:], dtype=np.uint8),
+            )
+            self._preview_bufs[self._preview_buf_index] = buffers
+        return buffers
+
+    @staticmethod
+    def _fit_to_label(image, size):
+        if size is None or size[0] <= 20 or size[1] <= 20:
+            return image
+        h, w = image.shape[:2]
+        scale = min(size[0] / w, size[1] / h)
+        if scale >= 1.0:
+            return image
+        return cv2.resize(
+            image,
+            (max(1, int(w * scale)), max(1, int(h * scale))),
+            interpolation=cv2.INTER_NEAREST,
+        )
+
+    def _paste_into_photo(self, label, photo, img):
+        if photo is None or (photo.width(), photo.height()) != img.size:
+            photo = ImageTk.PhotoImage(img.mode, img.size)
+            label.configure(image=photo)
+            label.image = photo
+        photo.paste(img)
+        return photo
+
+    def _render_latest_result(self):
         try:
-            preview_array, debug_mask, overlay_info = self.results_queue.get_nowait()
+            result = self._latest_result
+            if result is None:
+                return
+            self._latest_result = None
+            self._last_render_time = time.perf_counter()
+            preview_array, debug_mask, overlay_info = result
             if self.preview_window and self.preview_label:
                 pw, ph = (
                     self.preview_label.winfo_width(),
                     self.preview_label.winfo_height(),
                 )
                 if pw > 20 and ph > 20:
-                    img = Image.fromarray(
-                        cv2.cvtColor(preview_array, cv2.COLOR_BGR2RGB)
+                    preview_array = self._fit_to_label(preview_array, (pw, ph))
+                    ah, aw = preview_array.shape[:2]
+                    img = Image.frombuffer(
+                        "RGB", (aw, ah), preview_array, "raw", "BGR", 0, 1
+                    )
+                    self._preview_photo = self._paste_into_photo(
+                        self.preview_label, self._preview_photo, img
                     )
-                    img.thumbnail((pw, ph), Image.Resampling.NEAREST)
-                    photo = ImageTk.PhotoImage(image=img)
-                    self.preview_label.configure(image=photo)
-                    self.preview_label.image = photo
 
-                if hasattr(self, "velocity_info_label") and self.velocity_info_label:
+                if self.velocity_info_label:
                     velocity = overlay_info.get("velocity", 0)
                     acceleration = overlay_info.get("acceleration", 0)
                     line_detected = overlay_info.get("line_detected", False)
@@ -955,22 +1275,21 @@ class DigTool:
                     else:
                         velocity_text += " | Line: DETECTED"
 
-                    self.velocity_info_label.config(text=velocity_text)
+                    self._config_if_changed(self.velocity_info_label, text=velocity_text)
             if self.debug_window and self.debug_label and debug_mask is not None:
                 dw, dh = self.debug_label.winfo_width(), self.debug_label.winfo_height()
                 if dw > 20 and dh > 20:
-                    debug_bgr = cv2.cvtColor(debug_mask, cv2.COLOR_GRAY2BGR)
                     debug_img = Image.fromarray(
-                        cv2.cvtColor(debug_bgr, cv2.COLOR_BGR2RGB)
+                        self._fit_to_label(debug_mask, (dw, dh))
+                    )
+                    self._debug_photo = self._paste_into_photo(
+                        self.debug_label, self._debug_photo, debug_img
                     )
-                    debug_img.thumbnail((dw, dh), Image.Resampling.NEAREST)
-                    debug_photo = ImageTk.PhotoImage(image=debug_img)
-                    self.debug_label.configure(image=debug_photo)
-                    self.debug_label.image = debug_photo
             locked_color = overlay_info.get("locked_color_hex")
             if self.color_swatch_label:
-                self.color_swatch_label.config(
-                    bg=locked_color if locked_color else "#000000"
+                self._config_if_changed(
+                    self.color_swatch_label,
+                    bg=locked_color if locked_color else "#000000",
                 )
 
             if self.detection_info_label and overlay_info.get("detection_info"):
@@ -989,6 +1308,9 @@ class DigTool:
                         info_text += f"\nArea %: {detection_info['area_percentile']}"
                     if "morph_kernel" in detection_info:
                         info_text += f"\nMorph Kernel: {detection_info['morph_kernel']}"
+                elif "Locked Color" in method:
+                    if "target_color" in detection_info:
+                        info_text += f"\nTarget Color: {detection_info['target_color']}"
                 elif "Color Picker" in method:
                     if "target_color" in detection_info:
                         info_text += f"\nTarget Color: {detection_info['target_color']}"
@@ -997,17 +1319,14 @@ class DigTool:
                     if "target_hsv" in detection_info:
                         info_text += f"\nTarget HSV: {detection_info['target_hsv']}"
 
-                self.detection_info_label.config(text=info_text)
+                self._config_if_changed(self.detection_info_label, text=info_text)
 
             if self.overlay_enabled and self.overlay:
                 self.overlay.update_info(**overlay_info)
             if self.autowalk_overlay_enabled and self.autowalk_overlay:
                 self.autowalk_overlay.update_info(**overlay_info)
-        except (queue.Empty, RuntimeError, TclError):
+        except (RuntimeError, TclError):
             pass
-        finally:
-            if self.preview_active:
-                self.root.after(50, self.update_gui_from_queue)
 
     def toggle_detection(self):
         self.root.after(0, self._toggle_detection_thread_safe)
@@ -1026,7 +1345,7 @@ class DigTool:
             self.automation_manager.walk_pattern_index = 0
             self.automation_manager.sell_count = 0
             
-            self.startup_time = time.time() * 1000 
+            self.startup_time = time.perf_counter_ns() // 1_000_000
             self._startup_grace_ended = False
 
             self.automation_manager.shiftlock_state = {
@@ -1040,14 +1359,15 @@ class DigTool:
                 self.click_lock.release()
 
             self.target_engaged = False
-            self.line_moving_history = []
+            self.line_moving_history.fill(-1)
+            self._line_moving_index = 0
 
             try:
-                webhook_url = self.param_vars.get("webhook_url", tk.StringVar()).get()
-                user_id = self.param_vars.get("user_id", tk.StringVar()).get()
+                webhook_url = self._get_param_var_value("webhook_url")
+                user_id = self._get_param_var_value("user_id")
                 if webhook_url:
                     self.discord_notifier.set_webhook_url(webhook_url)
-                    threading.Thread(target=self.discord_notifier.send_startup_notification, args=(user_id), daemon=True).start()
+                    threading.Thread(target=self.discord_notifier.send_startup_notification, args=(user_id or None,), daemon=True).start()
             except:
                 pass
 
@@ -1057,17 +1377,23 @@ class DigTool:
             self.update_status("Stopped")
 
             try:
-                webhook_url = self.param_vars.get("webhook_url", tk.StringVar()).get()
-                user_id = self.param_vars.get("user_id", tk.StringVar()).get()
+                webhook_url = self._get_param_var_value("webhook_url")
+                user_id = self._get_param_var_value("user_id")
                 if webhook_url:
                     self.discord_notifier.set_webhook_url(webhook_url)
-                    threading.Thread(target=self.discord_notifier.send_shutdown_notification, args=(user_id), daemon=True).start()
+                    threading.Thread(target=self.discord_notifier.send_shutdown_notification, args=(user_id or None,), daemon=True).start()
             except:
                 pass
 
         self.update_main_button_text()
 
     def init_debug_log(self):
+        self._debug_log_thread = threading.Thread(
+            target=self._write_debug_log_header, daemon=True
+        )
+        self._debug_log_thread.start()
+
+    def _write_debug_log_header(self):
         try:
             self.ensure_debug_dir()
             with open(self.debug_log_path, "w") as f:
@@ -1085,25 +1411,30 @@ class DigTool:
         if self.root.winfo_exists():
             self.status_label.config(text=f"Status: {text}")
 
-    def _cleanup_click_threads(self):
-        self._click_thread_pool = [t for t in self._click_thread_pool if t.is_alive()]
-
     def perform_click(self, delay=0):
-        perform_click_action(
-            delay,
-            self.running,
-            self.get_param("use_custom_cursor"),
-            self.cursor_position,
-            self.click_lock,
-        )
-        self.click_count += 1
+        # Callers take click_lock with a non-blocking acquire; it is released
+        # here whatever happens so a failed click cannot wedge the lock.
+        try:
+            perform_click_action(
+                delay,
+                self.running,
+                self.get_param("use_custom_cursor"),
+                self.cursor_position,
+                None,
+            )
+            self.click_count += 1
+        finally:
+            if self.click_lock.locked():
+                self.click_lock.release()
 
     def perform_instant_click(self):
-        self._cleanup_click_threads()
-        if len(self._click_thread_pool) < self._max_click_threads:
-            click_thread = threading.Thread(target=self._instant_click, daemon=True)
-            self._click_thread_pool.append(click_thread)
-            click_thread.start()
+        self._pending_instant_clicks = [
+            f for f in self._pending_instant_clicks if not f.done()
+        ]
+        if len(self._pending_instant_clicks) < self._max_click_threads:
+            self._pending_instant_clicks.append(
+                self._click_executor.submit(self._instant_click)
+            )
 
     def _instant_click(self):
         if not self.running:
@@ -1130,6 +1461,9 @@ class DigTool:
     ):
         if not self.get_param("debug_clicks_enabled"):
             return
+        if self._debug_log_thread is not None:
+            # The header write truncates the log, so it must land first.
+            self._debug_log_thread.join()
         self.ensure_debug_dir()
         filename = save_debug_screenshot(
             screenshot,
@@ -1143,8 +1477,11 @@ class DigTool:
             confidence,
             self.click_count,
             self.debug_dir,
-            self.smoothed_zone_x,
-            self.smoothed_zone_w,
+            *(
+                self._smoothed_zone.tolist()
+                if self._smoothed_zone is not None
+                else (None, None)
+            ),
         )
         if filename:
             log_click_debug(
@@ -1160,18 +1497,31 @@ class DigTool:
                 self.debug_log_path,
             )
 
-    def _update_time_cache(self):
-        now = time.time()
-        if now - self._last_time_update > 0.001:
-            self._current_time_cache = now
-            self._current_time_ms_cache = now * 1000
-            self._last_time_update = now
+    def _perform_walk_step(self, direction):
+        if self.automation_manager.is_selling or not self.running:
+            logger.debug("Walk step aborted - selling in progress or tool stopped")
+            return
+
+        if isinstance(direction, dict):
+            key = direction.get("key", "")
+            custom_duration = direction.get("duration", None)
+            if custom_duration is not None:
+                success = self.automation_manager._execute_movement_with_duration(
+                    key, custom_duration / 1000.0
+                )
+            else:
+                success = self.automation_manager.perform_walk_step(key)
+        else:
+            success = self.automation_manager.perform_walk_step(direction)
+
+        if success:
+            self.automation_manager.advance_walk_pattern()
 
     def run_main_loop(self):
-        screenshot_fps = self.get_param("screenshot_fps") or 240
         process_every_nth_frame = 1
-
-        screenshot_delay = 1.0 / screenshot_fps
+        screenshot_delay = 1.0 / 240
+        game_fps = None
+        sweet_spot_width_key = None
         final_mask = None
 
         auto_walk_state = "move"
@@ -1181,7 +1531,9 @@ class DigTool:
         dig_completed_time = 0
         target_disengaged_time = 0
         pending_auto_sell = False
-        walk_thread = None
+        sell_wait_start = None
+        auto_sell_max_wait_time = 30.0
+        walk_future = None
         max_wait_time = 5000
         post_dig_delay = 2000
         click_retry_count = 0
@@ -1190,33 +1542,58 @@ class DigTool:
         cached_height_80 = None
         cached_zone_y2 = None
         cached_line_area = None
-        cached_hsv_area = None
+        cached_line_area_key = None
+        cached_bottom_area = None
+        max_change_threshold = 0.0
+        picker_error_logged = None
         frame_skip_counter = 0
         click_delay = 0  # UnboundLocalError
 
+        params = {}
+        self._params_dirty = True
+        screenshot_delay_ns = int(screenshot_delay * 1e9)
+        next_deadline_ns = time.perf_counter_ns()
+
         while self.preview_active:
-            frame_start_time = time.perf_counter()
-            self._update_time_cache()
-            current_time_ms = self._current_time_ms_cache
+            frame_start_ns = time.perf_counter_ns()
+
+            if self._params_dirty:
+                self._params_dirty = False
+                params = {key: self.get_param(key) for key in MAIN_LOOP_PARAMS}
+                screenshot_delay = 1.0 / (params["screenshot_fps"] or 240)
+                screenshot_delay_ns = int(screenshot_delay * 1e9)
+                new_game_fps = max(params["target_fps"], 1)
+                if new_game_fps != game_fps:
+                    game_fps = new_game_fps
+                    self.velocity_calculator.update_fps(game_fps)
+                    fps_threshold_factor = (game_fps / 120.0) ** 0.15
+                    fps_latency_factor = (120.0 / game_fps) * 0.8
+                width_key = (
+                    params["sweet_spot_width_percent"],
+                    params["velocity_based_width_enabled"],
+                    params["velocity_width_multiplier"],
+                    params["velocity_max_factor"],
+                )
+                if width_key != sweet_spot_width_key:
+                    sweet_spot_width_key = width_key
+                    sweet_spot_width_table, sweet_spot_width_scale = (
+                        build_sweet_spot_width_table(*width_key)
+                    )
+                    sweet_spot_width_last = len(sweet_spot_width_table) - 1
+            current_time_ms = frame_start_ns // 1_000_000
+            current_time = frame_start_ns / 1e9
+            # Detection details only feed the GUI; skip building them (and
+            # the pixel count behind the picker's) when nothing is shown.
+            want_info = self._has_frame_consumers()
+            detection_info = UNKNOWN_DETECTION_INFO
             
             startup_grace_period = 100 
-            if (hasattr(self, 'startup_time') and 
-                hasattr(self, '_startup_grace_ended') and 
-                not self._startup_grace_ended and 
+            if (not self._startup_grace_ended and
                 (current_time_ms - self.startup_time) > startup_grace_period):
                 self._startup_grace_ended = True
                 if self.running:
                     self.update_status("Bot Running...")
 
-            self._memory_cleanup_counter += 1
-            if self._memory_cleanup_counter % 300 == 0:
-                import gc
-
-                gc.collect()
-
-            game_fps = max(self.get_param("target_fps"), 1)
-            self.velocity_calculator.update_fps(game_fps)
-
             if self.game_area is None:
                 time.sleep(0.01)
                 continue
@@ -1227,9 +1604,7 @@ class DigTool:
             frame_skip_counter += 1
             should_process_zones = frame_skip_counter % process_every_nth_frame == 0
 
-            capture_start = time.perf_counter()
             screenshot = self.cam.capture(bbox=self.game_area, region_key=self.region_key)
-            capture_time = time.perf_counter() - capture_start
 
             if screenshot is None:
                 time.sleep(screenshot_delay)
@@ -1244,13 +1619,28 @@ class DigTool:
             height_80 = cached_height_80
             zone_y2 = cached_zone_y2
 
-            if cached_line_area is None or cached_line_area.shape != (height, width):
-                cached_line_area = np.empty((height, width), dtype=np.uint8)
-
-            cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY, dst=cached_line_area)
-            line_sensitivity = self.get_param("line_sensitivity")
+            # find_line_position only needs per-column statistics, and its
+            # thresholds scale with the row count, so every other row is enough.
+            # Keyed on the full frame size: the bottom view depends on height
+            # even when the subsampled row count does not change.
+            if cached_line_area_key != (height, width):
+                cached_line_area_key = (height, width)
+                line_rows = (height + LINE_ROW_STEP - 1) // LINE_ROW_STEP
+                cached_line_area = np.empty((line_rows, width), dtype=np.uint8)
+                max_change_threshold = width * 0.1
+                # A row slice of the persistent buffer stays C-contiguous and
+                # tracks its contents, so the fallback view is built once.
+                bottom_start = height - int(height * 0.3)
+                cached_bottom_area = cached_line_area[
+                    (bottom_start + LINE_ROW_STEP - 1) // LINE_ROW_STEP :, :
+                ]
+
+            cv2.cvtColor(
+                screenshot[::LINE_ROW_STEP], cv2.COLOR_BGR2GRAY, dst=cached_line_area
+            )
+            line_sensitivity = params["line_sensitivity"]
             line_min_height = 1.0
-            line_offset = self.get_param("line_detection_offset") or 5.0
+            line_offset = params["line_detection_offset"] or 5.0
             if isinstance(line_offset, str):
                 line_offset = float(line_offset)
 
@@ -1260,22 +1650,12 @@ class DigTool:
 
             velocity_line_pos = line_pos
             if line_pos == -1:
-                bottom_height = int(height * 0.3)
-                bottom_start = height - bottom_height
-                bottom_area = cached_line_area[bottom_start:, :]
                 velocity_line_pos = find_line_position(
-                    bottom_area, line_sensitivity, line_min_height, line_offset
+                    cached_bottom_area, line_sensitivity, line_min_height, line_offset
                 )
                 if velocity_line_pos != -1:
                     velocity_line_pos += 0
 
-            if not hasattr(self, "_line_detection_stats"):
-                self._line_detection_stats = {
-                    "detected": 0,
-                    "failed": 0,
-                    "last_positions": [],
-                }
-
             if line_pos == -1:
                 self._line_detection_stats["failed"] += 1
             else:
@@ -1285,114 +1665,124 @@ class DigTool:
                     self._line_detection_stats["last_positions"].pop(0)
 
             if should_process_zones:
-                if cached_hsv_area is None or cached_hsv_area.shape != (
+                if self._hsv_buf is None or self._hsv_buf.shape != (
                     height_80,
                     width,
                     3,
                 ):
-                    cached_hsv_area = np.empty((height_80, width, 3), dtype=np.uint8)
+                    self._allocate_zone_buffers(width, height)
 
                 zone_detection_area = screenshot[:height_80, :]
-                cv2.cvtColor(
-                    zone_detection_area, cv2.COLOR_BGR2HSV, dst=cached_hsv_area
+                hsv = self._hsv_buf
+                s_channel = self._hsv_s_view
+                final_mask = self._mask_buf
+                morph_tmp = self._morph_tmp
+                labels_buf = self._labels_buf
+
+                saturation_threshold = params["saturation_threshold"]
+                use_otsu = params["use_otsu_detection"]
+                use_color_picker = params["use_color_picker_detection"]
+                line_exclusion_radius = params["line_exclusion_radius"] or 0
+
+                # The plain saturation path reads BGR directly in one fused
+                # pass; every other path needs the full HSV image.
+                fused_saturation = NUMBA_AVAILABLE and not (
+                    self.is_color_locked or use_otsu or use_color_picker
                 )
-                hsv = cached_hsv_area
-
-                saturation_threshold = self.get_param("saturation_threshold")
+                hsv_ready = not fused_saturation
+                if hsv_ready:
+                    cv2.cvtColor(zone_detection_area, cv2.COLOR_BGR2HSV, dst=hsv)
 
                 if not self.is_color_locked:
-                    if final_mask is None or final_mask.shape != (height_80, width):
-                        final_mask = np.empty((height_80, width), dtype=np.uint8)
-
-                    use_otsu = self.get_param("use_otsu_detection")
-                    use_color_picker = self.get_param("use_color_picker_detection")
-                    detection_info = {}
-
                     if use_color_picker:
-                        picked_color = self.get_param("picked_color_rgb")
+                        picked_color = params["picked_color_rgb"]
                         if picked_color and picked_color.strip() and picked_color != "":
-                            try:
-                                picked_color = picked_color.strip()
-                                
-                                if picked_color.startswith("#"):
-                                    picked_color = picked_color[1:]
-                                    
-                                if len(picked_color) != 6:
-                                    raise ValueError(f"Invalid hex color length: {len(picked_color)}")
-                                    
-                                rgb_color = int(picked_color, 16)
-                                target_hsv = rgb_to_hsv_single(rgb_color)
-                                
-                                color_tolerance_param = self.get_param("color_tolerance")
+                            # A bad colour is parsed once per settings change;
+                            # its cached error selects the fallback directly.
+                            picker = self._get_picker_target(
+                                picked_color, params["color_tolerance"]
+                            )
+                            picker_error = picker["error"]
+                            if picker_error is None:
                                 try:
-                                    if isinstance(color_tolerance_param, str):
-                                        color_tolerance = int(float(color_tolerance_param.strip())) if color_tolerance_param.strip() else 30
-                                    else:
-                                        color_tolerance = int(color_tolerance_param) if color_tolerance_param is not None else 30
-                                except (ValueError, TypeError):
-                                    color_tolerance = 30
+                                    picked_color = picker["hex"]
+                                    target_hsv = picker["hsv"]
+                                    color_tolerance = picker["tolerance"]
 
-                                final_mask = detect_by_color_picker(
-                                    hsv, target_hsv, color_tolerance, False
-                                )
-                                
-                                detected_pixels = np.sum(final_mask > 0) if final_mask is not None else 0
-                                
-                                detection_info = {
-                                    "method": "Color Picker",
-                                    "target_color": f"#{picked_color}",
-                                    "tolerance": color_tolerance,
-                                    "target_hsv": f"H:{target_hsv[0]} S:{target_hsv[1]} V:{target_hsv[2]}",
-                                    "detected_pixels": detected_pixels,
-                                }
-                            except (ValueError, TypeError) as e:
-                                logger.warning(f"Color picker detection failed: {e}")
-                                saturation = hsv[:, :, 1]
+                                    final_mask = detect_by_color_picker(
+                                        hsv, target_hsv, color_tolerance, False, dst=final_mask
+                                    )
+
+                                    if want_info:
+                                        detected_pixels = (
+                                            cv2.countNonZero(final_mask)
+                                            if final_mask is not None
+                                            else 0
+                                        )
+                                        detection_info = {
+                                            "method": "Color Picker",
+                                            "target_color": f"#{picked_color}",
+                                            "tolerance": color_tolerance,
+                                            "target_hsv": f"H:{target_hsv[0]} S:{target_hsv[1]} V:{target_hsv[2]}",
+                                            "detected_pixels": detected_pixels,
+                                        }
+                                except (ValueError, TypeError) as e:
+                                    picker_error = e
+                            if picker_error is not None:
+                                if picker_error is not picker_error_logged:
+                                    logger.warning(
+                                        f"Color picker detection failed: {picker_error}"
+                                    )
+                                    picker_error_logged = picker_error
                                 cv2.threshold(
-                                    saturation,
+                                    s_channel,
                                     saturation_threshold,
                                     255,
                                     cv2.THRESH_BINARY,
                                     dst=final_mask,
                                 )
-                                detection_info = {
-                                    "method": "Saturation (Fallback)",
-                                    "threshold": saturation_threshold,
-                                    "error": f"Color picker failed: {e}",
-                                }
+                                if want_info:
+                                    detection_info = {
+                                        "method": "Saturation (Fallback)",
+                                        "threshold": saturation_threshold,
+                                        "error": f"Color picker failed: {picker_error}",
+                                    }
                         else:
-                            saturation = hsv[:, :, 1]
                             cv2.threshold(
-                                saturation,
+                                s_channel,
                                 saturation_threshold,
                                 255,
                                 cv2.THRESH_BINARY,
                                 dst=final_mask,
                             )
-                            detection_info = {
-                                "method": "Saturation (No Color Picked)",
-                                "threshold": saturation_threshold,
-                            }
+                            if want_info:
+                                detection_info = {
+                                    "method": "Saturation (No Color Picked)",
+                                    "threshold": saturation_threshold,
+                                }
                     elif use_otsu:
-                        if self.get_param("otsu_adaptive_area"):
+                        if params["otsu_adaptive_area"]:
                             area_percentile = float(
-                                self.get_param("otsu_area_percentile")
+                                params["otsu_area_percentile"]
                             )
-                            morph_kernel = int(self.get_param("otsu_morph_kernel_size"))
+                            morph_kernel = int(params["otsu_morph_kernel_size"])
                             final_mask, threshold_value = detect_by_otsu_adaptive_area(
                                 hsv,
                                 area_percentile=area_percentile,
                                 morph_kernel_size=morph_kernel,
+                                use_umat=self._use_umat,
+                                dst=final_mask,
                             )
-                            detection_info = {
-                                "method": "Otsu (Adaptive)",
-                                "threshold": threshold_value,
-                                "area_percentile": area_percentile,
-                                "morph_kernel": morph_kernel,
-                            }
+                            if want_info:
+                                detection_info = {
+                                    "method": "Otsu (Adaptive)",
+                                    "threshold": threshold_value,
+                                    "area_percentile": area_percentile,
+                                    "morph_kernel": morph_kernel,
+                                }
                         else:
-                            min_area = int(self.get_param("otsu_min_area"))
-                            max_area_param = self.get_param("otsu_max_area")
+                            min_area = int(params["otsu_min_area"])
+                            max_area_param = params["otsu_max_area"]
                             if (
                                 max_area_param == ""
                                 or max_area_param == "None"
@@ -1405,40 +1795,59 @@ class DigTool:
                                     max_area = int(max_area_param)
                                 except (ValueError, TypeError):
                                     max_area = None
-                            morph_kernel = int(self.get_param("otsu_morph_kernel_size"))
+                            morph_kernel = int(params["otsu_morph_kernel_size"])
                             final_mask, threshold_value = (
                                 detect_by_otsu_with_area_filter(
                                     hsv,
                                     min_area=min_area,
                                     max_area=max_area,
                                     morph_kernel_size=morph_kernel,
+                                    use_umat=self._use_umat,
+                                    dst=final_mask,
                                 )
                             )
+                            if want_info:
+                                detection_info = {
+                                    "method": "Otsu (Fixed Area)",
+                                    "threshold": threshold_value,
+                                    "min_area": min_area,
+                                    "max_area": (
+                                        max_area if max_area is not None else "Unlimited"
+                                    ),
+                                    "morph_kernel": morph_kernel,
+                                }
+                    elif fused_saturation:
+                        saturation_threshold_mask(
+                            zone_detection_area,
+                            saturation_threshold,
+                            line_pos,
+                            line_exclusion_radius,
+                            final_mask,
+                        )
+                        if want_info:
                             detection_info = {
-                                "method": "Otsu (Fixed Area)",
-                                "threshold": threshold_value,
-                                "min_area": min_area,
-                                "max_area": (
-                                    max_area if max_area is not None else "Unlimited"
-                                ),
-                                "morph_kernel": morph_kernel,
+                                "method": "Saturation Threshold",
+                                "threshold": saturation_threshold,
                             }
                     else:
-                        saturation = hsv[:, :, 1]
                         cv2.threshold(
-                            saturation,
+                            s_channel,
                             saturation_threshold,
                             255,
                             cv2.THRESH_BINARY,
                             dst=final_mask,
                         )
-                        detection_info = {
-                            "method": "Saturation Threshold",
-                            "threshold": saturation_threshold,
-                        }
+                        if want_info:
+                            detection_info = {
+                                "method": "Saturation Threshold",
+                                "threshold": saturation_threshold,
+                            }
 
-                    line_exclusion_radius = self.get_param("line_exclusion_radius") or 0
-                    if line_exclusion_radius > 0 and line_pos != -1:
+                    if (
+                        not fused_saturation
+                        and line_exclusion_radius > 0
+                        and line_pos != -1
+                    ):
                         cv2.rectangle(
                             final_mask,
                             (max(0, line_pos - line_exclusion_radius), 0),
@@ -1453,46 +1862,33 @@ class DigTool:
                             self._cached_kernel is None
                             or self._cached_kernel_size != kernel_size
                         ):
-                            self._cached_kernel = cv2.getStructuringElement(
+                            ellipse = cv2.getStructuringElement(
                                 cv2.MORPH_ELLIPSE, (kernel_size, kernel_size)
                             )
+                            self._cached_kernel = ellipse
+                            (
+                                self._cached_kernel_doubled,
+                                self._cached_kernel_anchor,
+                            ) = double_structuring_element(ellipse)
                             self._cached_kernel_size = kernel_size
                         cv2.morphologyEx(
                             final_mask,
                             cv2.MORPH_CLOSE,
-                            self._cached_kernel,
-                            dst=final_mask,
-                            iterations=2,
+                            self._cached_kernel_doubled,
+                            dst=morph_tmp,
+                            anchor=self._cached_kernel_anchor,
                         )
                         cv2.morphologyEx(
-                            final_mask,
+                            morph_tmp,
                             cv2.MORPH_OPEN,
                             self._cached_kernel,
                             dst=final_mask,
-                            iterations=1,
                         )
                 else:
-                    if (
-                        self._last_hsv_color is None
-                        or not np.array_equal(
-                            self.locked_color_hsv, self._last_hsv_color
-                        )
-                        or self._last_is_low_sat != self.is_low_sat_lock
-                    ):
-                        self._hsv_lower_bound_cache, self._hsv_upper_bound_cache = (
-                            get_hsv_bounds(self.locked_color_hsv, self.is_low_sat_lock)
-                        )
-                        self._last_hsv_color = self.locked_color_hsv.copy()
-                        self._last_is_low_sat = self.is_low_sat_lock
-                    lower_bound, upper_bound = (
-                        self._hsv_lower_bound_cache,
-                        self._hsv_upper_bound_cache,
-                    )
-                    if final_mask is None or final_mask.shape != (height_80, width):
-                        final_mask = np.empty((height_80, width), dtype=np.uint8)
+                    lower_bound, upper_bound = self._get_locked_hsv_bounds()
                     cv2.inRange(hsv, lower_bound, upper_bound, dst=final_mask)
+                    detection_info = self._locked_detection_info
 
-                    line_exclusion_radius = self.get_param("line_exclusion_radius") or 0
                     if line_exclusion_radius > 0 and line_pos != -1:
                         cv2.rectangle(
                             final_mask,
@@ -1507,23 +1903,22 @@ class DigTool:
                     cv2.MORPH_CLOSE,
                     self._kernel,
                     dst=final_mask,
-                    iterations=2,
                 )
-                contours, _ = cv2.findContours(
-                    final_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+                num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+                    final_mask, labels=labels_buf, connectivity=8
                 )
 
                 raw_zone_x, raw_zone_w = None, None
-                if contours:
-                    main_contour = max(contours, key=cv2.contourArea)
-                    x_temp, y_temp, w_temp, h_temp = cv2.boundingRect(main_contour)
+                if num_labels > 1:
+                    main_label = int(np.argmax(stats[1:, cv2.CC_STAT_AREA])) + 1
+                    x_temp, y_temp, w_temp, h_temp = stats[main_label, :4]
 
-                    zone_min_width = self.get_param("zone_min_width")
+                    zone_min_width = params["zone_min_width"]
                     max_zone_width = width * (
-                        self.get_param("max_zone_width_percent") / 100.0
+                        params["max_zone_width_percent"] / 100.0
                     )
                     min_zone_height = height_80 * (
-                        self.get_param("min_zone_height_percent") / 100.0
+                        params["min_zone_height_percent"] / 100.0
                     )
 
                     if (
@@ -1533,18 +1928,34 @@ class DigTool:
                     ):
                         raw_zone_x, raw_zone_w = x_temp, w_temp
                         if not self.is_color_locked:
-                            mask = np.zeros(hsv.shape[:2], dtype="uint8")
-                            cv2.drawContours(mask, [main_contour], -1, 255, -1)
-                            mean_hsv = cv2.mean(hsv, mask=mask)
-                            self.locked_color_hsv = np.array(
-                                mean_hsv[:3], dtype=np.float32
+                            # Sample only the component's bounding box.
+                            roi = (
+                                slice(y_temp, y_temp + h_temp),
+                                slice(x_temp, x_temp + w_temp),
+                            )
+                            hsv_roi = hsv[roi]
+                            if not hsv_ready:
+                                cv2.cvtColor(
+                                    zone_detection_area[roi],
+                                    cv2.COLOR_BGR2HSV,
+                                    dst=hsv_roi,
+                                )
+                            mask_roi = morph_tmp[roi]
+                            cv2.compare(
+                                labels[roi], main_label, cv2.CMP_EQ, dst=mask_roi
+                            )
+                            mean_hsv = cv2.mean(hsv_roi, mask=mask_roi)
+                            self.locked_color_hsv = (
+                                float(mean_hsv[0]),
+                                float(mean_hsv[1]),
+                                float(mean_hsv[2]),
                             )
                             self.is_color_locked = True
-                            bgr_color = cv2.cvtColor(
-                                np.uint8([[self.locked_color_hsv]]), cv2.COLOR_HSV2BGR
-                            )[0][0]
-                            self.locked_color_hex = f"#{bgr_color[2]:02x}{bgr_color[1]:02x}{bgr_color[0]:02x}"
+                            self.locked_color_hex = self._hsv_to_hex(
+                                *self.locked_color_hsv
+                            )
                             self.is_low_sat_lock = self.locked_color_hsv[1] < 25
+                            self._locked_color_version += 1
             else:
                 raw_zone_x, raw_zone_w = None, None
 
@@ -1552,36 +1963,30 @@ class DigTool:
                 self.automation_manager.update_target_lock_activity()
                 self.frames_since_last_zone_detection = 0
 
-                zone_smoothing_factor = self.get_param("zone_smoothing_factor")
+                zone_smoothing_factor = params["zone_smoothing_factor"]
 
-                if self.smoothed_zone_x is None:
-                    self.smoothed_zone_x, self.smoothed_zone_w = raw_zone_x, raw_zone_w
+                if self._smoothed_zone is None:
+                    self._smoothed_zone = np.array(
+                        [raw_zone_x, raw_zone_w], dtype=np.float32
+                    )
                 else:
-                    position_change = abs(raw_zone_x - self.smoothed_zone_x)
-                    width_change = abs(raw_zone_w - self.smoothed_zone_w)
+                    zone_delta = self._raw_zone_buf
+                    zone_delta[0] = raw_zone_x
+                    zone_delta[1] = raw_zone_w
+                    zone_delta -= self._smoothed_zone
 
                     if zone_smoothing_factor >= 1.0:
-                        adaptive_smoothing = 1.0 
-                    elif zone_smoothing_factor <= 0.01:
-                        adaptive_smoothing = zone_smoothing_factor 
+                        adaptive_smoothing = 1.0
+                    elif (
+                        zone_smoothing_factor > 0.01
+                        and np.abs(zone_delta).max() > max_change_threshold
+                    ):
+                        adaptive_smoothing = min(zone_smoothing_factor + 0.1, 1.0)
                     else:
-                        max_change_threshold = width * 0.1
-                        if (
-                            position_change > max_change_threshold
-                            or width_change > max_change_threshold
-                        ):
-                            adaptive_smoothing = min(zone_smoothing_factor + 0.1, 1.0)
-                        else:
-                            adaptive_smoothing = zone_smoothing_factor
+                        adaptive_smoothing = zone_smoothing_factor
 
-                    self.smoothed_zone_x = (
-                        adaptive_smoothing * raw_zone_x
-                        + (1 - adaptive_smoothing) * self.smoothed_zone_x
-                    )
-                    self.smoothed_zone_w = (
-                        adaptive_smoothing * raw_zone_w
-                        + (1 - adaptive_smoothing) * self.smoothed_zone_w
-                    )
+                    zone_delta *= adaptive_smoothing
+                    self._smoothed_zone += zone_delta
             else:
                 self.frames_since_last_zone_detection += 1
 
@@ -1590,44 +1995,39 @@ class DigTool:
                 self.is_color_locked = False
                 self.locked_color_hsv = None
                 self.locked_color_hex = None
-                self.smoothed_zone_x = None
+                self._smoothed_zone = None
 
             velocity = self.velocity_calculator.add_position(
-                velocity_line_pos, self._current_time_cache
+                velocity_line_pos, current_time
             )
             acceleration = self.velocity_calculator.get_acceleration()
 
             display_velocity = 0.0
-            if len(self.velocity_calculator.position_history) >= 2:
-                recent_positions = list(self.velocity_calculator.position_history)[-2:]
-                if len(recent_positions) == 2:
-                    pos1, t1 = recent_positions[0]
-                    pos2, t2 = recent_positions[1]
-                    if pos1 != -1 and pos2 != -1 and t2 > t1:
-                        display_velocity = (pos2 - pos1) / (t2 - t1)
+            position_history = self.velocity_calculator.position_history
+            if len(position_history) >= 2:
+                pos1, t1 = position_history[-2]
+                pos2, t2 = position_history[-1]
+                if pos1 != -1 and pos2 != -1 and t2 > t1:
+                    display_velocity = (pos2 - pos1) / (t2 - t1)
 
-            self.target_engaged = self.check_target_engagement(line_pos, game_fps)
+            target_engaged = self.check_target_engagement(line_pos, game_fps)
+            self.target_engaged = target_engaged
 
             sweet_spot_center, sweet_spot_start, sweet_spot_end = None, None, None
-            if self.smoothed_zone_x is not None:
-                sweet_spot_center = self.smoothed_zone_x + self.smoothed_zone_w / 2
+            if self._smoothed_zone is not None:
+                zone_x, zone_w = self._smoothed_zone.tolist()
+                sweet_spot_center = zone_x + zone_w / 2
 
-                base_sweet_spot_width_percent = (
-                    self.get_param("sweet_spot_width_percent") / 100.0
-                )
                 dynamic_sweet_spot_width_percent = (
-                    calculate_velocity_based_sweet_spot_width(
-                        base_sweet_spot_width_percent * 100.0,
-                        velocity,
-                        enabled=self.get_param("velocity_based_width_enabled"),
-                        velocity_multiplier=self.get_param("velocity_width_multiplier"),
-                        max_velocity_factor=self.get_param("velocity_max_factor"),
-                    )
+                    sweet_spot_width_table[
+                        min(
+                            int(abs(velocity) * sweet_spot_width_scale),
+                            sweet_spot_width_last,
+                        )
+                    ]
                     / 100.0
                 )
-                sweet_spot_width = (
-                    self.smoothed_zone_w * dynamic_sweet_spot_width_percent
-                )
+                sweet_spot_width = zone_w * dynamic_sweet_spot_width_percent
                 sweet_spot_start = sweet_spot_center - sweet_spot_width / 2
                 sweet_spot_end = sweet_spot_center + sweet_spot_width / 2
 
@@ -1640,10 +2040,27 @@ class DigTool:
                     pending_auto_sell = False
                     dig_completed_time = 0
 
+            # The state machine below reads these on most branches; look
+            # them up once per frame.
+            am = self.automation_manager
+            is_selling = am.is_selling
+            running = self.running
+            auto_walk_enabled = params["auto_walk_enabled"]
+
+            if sell_wait_start is not None:
+                # Keep capturing while the sell runs; autowalk resumes once
+                # the sell thread signals completion or the wait times out.
+                if am.sell_done_event.is_set() or not running:
+                    sell_wait_start = None
+                elif current_time - sell_wait_start >= auto_sell_max_wait_time:
+                    logger.warning("Auto-sell wait timeout reached, resuming autowalk")
+                    sell_wait_start = None
+
             if (
-                self.running
-                and self.get_param("auto_walk_enabled")
-                and not self.automation_manager.is_selling
+                running
+                and auto_walk_enabled
+                and not is_selling
+                and sell_wait_start is None
             ):
                 if auto_walk_state == "move":
                     if (
@@ -1652,34 +2069,15 @@ class DigTool:
                         and current_time_ms - dig_completed_time >= post_dig_delay
                     ):
                         logger.debug(
-                            f"Initiating auto-sell: dig_count={self.dig_count}, sell_every_x_digs={self.get_param('sell_every_x_digs')}"
+                            f"Initiating auto-sell: dig_count={self.dig_count}, sell_every_x_digs={params['sell_every_x_digs']}"
                         )
 
-                        if self.automation_manager.is_auto_sell_ready():
-                            threading.Thread(
-                                target=self.automation_manager.perform_auto_sell,
-                                daemon=True,
-                            ).start()
+                        if am.is_auto_sell_ready():
+                            am.sell_done_event.clear()
+                            self._action_executor.submit(am.perform_auto_sell)
                             pending_auto_sell = False
                             dig_completed_time = 0
-
-                            wait_start_time = time.time()
-                            auto_sell_max_wait_time = 30.0
-
-                            while (
-                                self.automation_manager.is_selling
-                                and self.running
-                                and (time.time() - wait_start_time)
-                                < auto_sell_max_wait_time
-                            ):
-                                time.sleep(0.1)
-
-                            if (
-                                time.time() - wait_start_time
-                            ) >= auto_sell_max_wait_time:
-                                logger.warning(
-                                    "Auto-sell wait timeout reached, resuming autowalk"
-                                )
+                            sell_wait_start = current_time
                         else:
                             logger.warning(
                                 "Auto-sell skipped: not ready (sell button, running state, or already selling)"
@@ -1687,13 +2085,9 @@ class DigTool:
                             pending_auto_sell = False
                             dig_completed_time = 0
 
-                    elif (
-                        not self.automation_manager.is_selling and not pending_auto_sell
-                    ):
-                        if walk_thread is None or not walk_thread.is_alive():
-                            direction = (
-                                self.automation_manager.get_next_walk_direction()
-                            )
+                    elif not is_selling and not pending_auto_sell:
+                        if walk_future is None or walk_future.done():
+                            direction = am.get_next_walk_direction()
 
                             if isinstance(direction, dict):
                                 current_step_click_enabled = direction.get(
@@ -1702,41 +2096,9 @@ class DigTool:
                             else:
                                 current_step_click_enabled = True
 
-                            def perform_walk_with_callback():
-                                if (
-                                    self.automation_manager.is_selling
-                                    or not self.running
-                                ):
-                                    logger.debug(
-                                        "Walk step aborted - selling in progress or tool stopped"
-                                    )
-                                    return
-
-                                if isinstance(direction, dict):
-                                    key = direction.get("key", "")
-                                    custom_duration = direction.get("duration", None)
-                                    if custom_duration is not None:
-                                        success = self.automation_manager._execute_movement_with_duration(
-                                            key, custom_duration / 1000.0
-                                        )
-                                    else:
-                                        success = (
-                                            self.automation_manager.perform_walk_step(
-                                                key
-                                            )
-                                        )
-                                else:
-                                    success = self.automation_manager.perform_walk_step(
-                                        direction
-                                    )
-
-                                if success:
-                                    self.automation_manager.advance_walk_pattern()
-
-                            walk_thread = threading.Thread(
-                                target=perform_walk_with_callback, daemon=True
+                            walk_future = self._action_executor.submit(
+                                self._perform_walk_step, direction
                             )
-                            walk_thread.start()
 
                             auto_walk_state = "click_to_start"
 
@@ -1746,32 +2108,26 @@ class DigTool:
                             ):
                                 walk_duration = direction.get("duration")
                             else:
-                                walk_duration = self.get_param("walk_duration")
+                                walk_duration = params["walk_duration"]
 
                             move_completed_time = current_time_ms + walk_duration + 300
 
                 elif (
                     auto_walk_state == "click_to_start"
                     and current_time_ms >= move_completed_time
-                    and not self.automation_manager.is_selling
+                    and not is_selling
                 ):
                     if current_step_click_enabled:
-                        if not self.click_lock.locked():
-                            self.click_lock.acquire()
-                            threading.Thread(
-                                target=self.perform_click, args=(click_delay,)
-                            ).start()
+                        if self.click_lock.acquire(blocking=False):
+                            self._click_executor.submit(self.perform_click, click_delay)
                             auto_walk_state = "wait_for_target"
                             wait_for_target_start = current_time_ms
                     else:
                         logger.debug("Skipping click for this step (click disabled)")
                         auto_walk_state = "move"
 
-                elif (
-                    auto_walk_state == "wait_for_target"
-                    and not self.automation_manager.is_selling
-                ):
-                    if self.target_engaged:
+                elif auto_walk_state == "wait_for_target" and not is_selling:
+                    if target_engaged:
                         auto_walk_state = "digging"
                         target_disengaged_time = 0
                         click_retry_count = 0
@@ -1782,11 +2138,8 @@ class DigTool:
                                 f"Target engagement timeout - retry {click_retry_count}/{max_click_retries}"
                             )
 
-                            if not self.click_lock.locked():
-                                self.click_lock.acquire()
-                                threading.Thread(
-                                    target=self.perform_click, args=(0,)
-                                ).start()
+                            if self.click_lock.acquire(blocking=False):
+                                self._click_executor.submit(self.perform_click, 0)
                                 wait_for_target_start = current_time_ms
                         else:
                             logger.warning(
@@ -1796,29 +2149,29 @@ class DigTool:
                             auto_walk_state = "move"
 
                 elif auto_walk_state == "digging":
-                    if not self.target_engaged:
+                    if not target_engaged:
                         if target_disengaged_time == 0:
                             target_disengaged_time = current_time_ms
                     else:
                         target_disengaged_time = 0
 
             should_allow_clicking = True
-            if self.get_param("auto_walk_enabled"):
+            if auto_walk_enabled:
                 should_allow_clicking = (
                     auto_walk_state == "digging"
-                    and not self.automation_manager.is_selling
-                    and self.target_engaged
+                    and not is_selling
+                    and target_engaged
                 )
             else:
-                should_allow_clicking = self.target_engaged
+                should_allow_clicking = target_engaged
 
-            post_click_blindness = self.get_param("post_click_blindness")
+            post_click_blindness = params["post_click_blindness"]
             
             startup_grace_period = 100  
-            is_past_startup_grace = not hasattr(self, 'startup_time') or (current_time_ms - self.startup_time) > startup_grace_period
+            is_past_startup_grace = (current_time_ms - self.startup_time) > startup_grace_period
 
             if (
-                self.running
+                running
                 and should_allow_clicking
                 and current_time_ms >= self.blind_until
                 and sweet_spot_center is not None
@@ -1835,10 +2188,8 @@ class DigTool:
 
                 line_in_sweet_spot = sweet_spot_start <= line_pos <= sweet_spot_end
 
-                if self.get_param("prediction_enabled") and line_pos != -1:
-                    prediction_confidence_threshold = self.get_param(
-                        "prediction_confidence_threshold"
-                    )
+                if params["prediction_enabled"] and line_pos != -1:
+                    prediction_confidence_threshold = params["prediction_confidence_threshold"]
                     system_latency = self.get_cached_system_latency() / 1000.0
 
                     is_moving_towards = (
@@ -1848,7 +2199,7 @@ class DigTool:
                     if is_moving_towards:
                         predicted_pos, prediction_time = (
                             self.velocity_calculator.predict_position(
-                                line_pos, sweet_spot_center, self._current_time_cache
+                                line_pos, sweet_spot_center, current_time
                             )
                         )
 
@@ -1874,12 +2225,12 @@ class DigTool:
 
                                 fps_adjusted_threshold = (
                                     prediction_confidence_threshold
-                                    * (game_fps / 120.0) ** 0.15
+                                    * fps_threshold_factor
                                 )
 
                                 if confidence >= fps_adjusted_threshold:
                                     fps_latency_adjustment = (
-                                        system_latency * (120.0 / game_fps) * 0.8
+                                        system_latency * fps_latency_factor
                                     )
                                     sleep_duration = (
                                         prediction_time - fps_latency_adjustment
@@ -1897,7 +2248,7 @@ class DigTool:
                     confidence = 1.0
 
                 if should_click:
-                    self.automation_manager.update_click_activity()
+                    am.update_click_activity()
                     self.save_debug_screenshot(
                         screenshot,
                         line_pos,
@@ -1913,27 +2264,22 @@ class DigTool:
 
                     if click_delay == 0:
                         self.perform_instant_click()
-                    else:
-                        self.click_lock.acquire()
-                        threading.Thread(
-                            target=self.perform_click, args=(click_delay,)
-                        ).start()
+                    elif self.click_lock.acquire(blocking=False):
+                        self._click_executor.submit(self.perform_click, click_delay)
 
             if (
-                self.get_param("auto_walk_enabled")
+                auto_walk_enabled
                 and auto_walk_state == "digging"
                 and target_disengaged_time > 0
                 and current_time_ms - target_disengaged_time > 1500
             ):
                 self.dig_count += 1
-                self.automation_manager.update_dig_activity()
+                am.update_dig_activity()
                 dig_completed_time = current_time_ms
 
-                auto_sell_enabled = self.get_param("auto_sell_enabled")
-                sell_every_x_digs = self.get_param("sell_every_x_digs")
-                has_sell_button = (
-                    self.automation_manager.sell_button_position is not None
-                )
+                auto_sell_enabled = params["auto_sell_enabled"]
+                sell_every_x_digs = params["sell_every_x_digs"]
+                has_sell_button = am.sell_button_position is not None
 
                 logger.info(
                     f"Dig completed #{self.dig_count}: auto_sell_enabled={auto_sell_enabled}, sell_button_set={has_sell_button}, sell_every_x_digs={sell_every_x_digs}"
@@ -1953,13 +2299,26 @@ class DigTool:
                 auto_walk_state = "move"
                 self.check_milestone_notifications()
 
-            if self.results_queue.empty():
-                preview_img = screenshot.copy()
+            # Keep the slot on the newest frame once the GUI is due to render;
+            # frames produced while the GUI is still inside its minimum
+            # interval are never copied.
+            if (
+                current_time - self._last_preview_push >= self._preview_min_interval
+                and (
+                    self._latest_result is None
+                    or current_time - self._last_render_time >= self._gui_min_interval
+                )
+                and want_info
+            ):
+                self._last_preview_push = current_time
+                preview_img, thumbnail = self._next_preview_buffers(screenshot.shape)
+                np.copyto(preview_img, screenshot)
                 if sweet_spot_center is not None:
+                    zone_x0, zone_x1 = int(zone_x), int(zone_x + zone_w)
                     cv2.rectangle(
                         preview_img,
-                        (int(self.smoothed_zone_x), 0),
-                        (int(self.smoothed_zone_x + self.smoothed_zone_w), zone_y2),
+                        (zone_x0, 0),
+                        (zone_x1, zone_y2),
                         (0, 255, 0),
                         2,
                     )
@@ -1971,15 +2330,23 @@ class DigTool:
                         2,
                     )
                 if line_pos != -1:
-                    cv2.line(
-                        preview_img, (line_pos, 0), (line_pos, height), (0, 0, 255), 1
+                    # A one-pixel vertical line is a single column write.
+                    preview_img[:, line_pos, :3] = (0, 0, 255)
+                # A strided view is a nearest-neighbour downscale for free, but
+                # only covers the whole frame when the sizes divide exactly;
+                # otherwise resize so the right and bottom edges are kept.
+                th, tw = thumbnail.shape[:2]
+                if height % th == 0 and width % tw == 0:
+                    np.copyto(
+                        thumbnail, preview_img[:: height // th, :: width // tw]
+                    )
+                else:
+                    cv2.resize(
+                        preview_img,
+                        (tw, th),
+                        dst=thumbnail,
+                        interpolation=cv2.INTER_NEAREST,
                     )
-                h, w = preview_img.shape[:2]
-                thumbnail = cv2.resize(
-                    preview_img,
-                    (150, int(150 * h / w)),
-                    interpolation=cv2.INTER_NEAREST,
-                )
 
                 overlay_info = {
                     "sweet_spot_center": sweet_spot_center,
@@ -1994,37 +2361,48 @@ class DigTool:
                     "target_engaged": self.target_engaged,
                     "line_detected": line_pos != -1,
                     # 'benchmark_fps': self.benchmark_fps,
-                    "detection_info": (
-                        detection_info
-                        if "detection_info" in locals()
-                        else {"method": "Unknown", "threshold": "N/A"}
-                    ),
+                    "detection_info": detection_info,
                 }
-                try:
-                    self.results_queue.put_nowait(
-                        (preview_img, final_mask, overlay_info)
-                    )
-                except queue.Full:
-                    pass
+                preview_array = (
+                    self._fit_to_label(preview_img, self._preview_size)
+                    if self.preview_window
+                    else preview_img
+                )
+                debug_array = (
+                    self._fit_to_label(final_mask, self._debug_size)
+                    if self.debug_window and final_mask is not None
+                    else final_mask
+                )
+                self._latest_result = (preview_array, debug_array, overlay_info)
+                self._result_ready = True
 
              # Benchmarking
-            now = time.time()
-            frame_time = frame_start_time - self.last_frame_time
-            self.last_frame_time = frame_start_time
-
-            self.frame_times.append(frame_time)
+            frame_time_ns = frame_start_ns - self.last_frame_time
+            self.last_frame_time = frame_start_ns
 
-            if now - self.last_report_time >= self.report_interval:
-                if self.frame_times:
-                    avg_frame_time = sum(self.frame_times) / len(self.frame_times)
-                    self.benchmark_fps = int(1.0 / avg_frame_time) if avg_frame_time > 0 else 0
-                    # logger.debug(f"Benchmark: {self.benchmark_fps} FPS (avg frame time: {avg_frame_time*1000:.2f}ms)")
-                    self.frame_times.clear()
-                self.last_report_time = now
-            elapsed = time.perf_counter() - frame_start_time
+            if self._frame_time_ema is None:
+                self._frame_time_ema = float(frame_time_ns)
+            else:
+                self._frame_time_ema += self._frame_time_alpha * (
+                    frame_time_ns - self._frame_time_ema
+                )
 
-            if screenshot_delay > elapsed:
-                time.sleep(screenshot_delay - elapsed)
+            if frame_start_ns - self.last_report_time >= self.report_interval * 1_000_000_000:
+                avg_frame_time_ns = self._frame_time_ema
+                self.benchmark_fps = int(1_000_000_000 / avg_frame_time_ns) if avg_frame_time_ns > 0 else 0
+                # logger.debug(f"Benchmark: {self.benchmark_fps} FPS (avg frame time: {avg_frame_time_ns / 1e6:.2f}ms)")
+                self.last_report_time = frame_start_ns
+            # Pace against an absolute deadline: sleep coarsely, then spin the
+            # last millisecond so the cadence does not inherit sleep jitter.
+            now_ns = time.perf_counter_ns()
+            next_deadline_ns += screenshot_delay_ns
+            if next_deadline_ns < now_ns - screenshot_delay_ns:
+                next_deadline_ns = now_ns
+            remaining_ns = next_deadline_ns - now_ns
+            if remaining_ns > 2_000_000:
+                time.sleep((remaining_ns - 1_000_000) / 1e9)
+            while time.perf_counter_ns() < next_deadline_ns:
+                pass
 
     def run(self):
         self.root.mainloop()
@@ -2043,22 +2421,14 @@ class DigTool:
             return default_latency
 
     def get_cached_system_latency(self):
-        if hasattr(self, "_cached_latency") and hasattr(
-            self, "_latency_measurement_time"
-        ):
-            if time.time() - self._latency_measurement_time < 300:
-                return self._cached_latency
-
-        if not hasattr(self, "_cached_latency") or not hasattr(
-            self, "_latency_measurement_time"
-        ):
-            logger.info("Measuring system latency (one-time measurement)...")
-            measured_latency = self.measure_system_latency()
-            self._cached_latency = measured_latency
-            self._latency_measurement_time = time.time()
-            return measured_latency
+        if self._cached_latency is not None:
+            return self._cached_latency
 
-        return self._cached_latency
+        logger.info("Measuring system latency (one-time measurement)...")
+        measured_latency = self.measure_system_latency()
+        self._cached_latency = measured_latency
+        self._latency_measurement_time = time.monotonic()
+        return measured_latency
 
     def _initialize_default_param_vars(self):
         for key, default_value in self.settings_manager.default_params.items():
@@ -2069,6 +2439,26 @@ class DigTool:
         for key, default_value in self.settings_manager.default_keybinds.items():
             self.keybind_vars[key] = tk.StringVar(value=default_value)
 
+        for key, var in self.param_vars.items():
+            if key == "system_latency":
+                # Resolved through the latency cache, never the raw setting.
+                continue
+            var.trace_add("write", lambda *_, k=key: self._refresh_param_snapshot(k))
+            self._refresh_param_snapshot(key)
+
+    def _refresh_param_snapshot(self, key):
+        try:
+            value = self.param_vars[key].get()
+        except (TclError, ValueError):
+            value = None
+        if value is None or (isinstance(value, str) and value.strip() == ""):
+            value = self._param_snapshot.pop(key, None)
+            if value is not None:
+                self._params_dirty = True
+        elif self._param_snapshot.get(key) != value:
+            self._param_snapshot[key] = value
+            self._params_dirty = True
+
     def _check_and_enable_buttons(self):
         if (
             self.game_area
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from core.detection import (
+    NUMBA_AVAILABLE,
+    get_hsv_bounds,
+    locked_color_detection_info,
+    saturation_threshold_mask,
+)
+
+
+def _all_max_min_pairs():
+    # One BGR pixel per (max, min) pair: B carries the max, G and R the min.
+    pairs = [(mx, mn) for mx in range(256) for mn in range(mx + 1)]
+    bgr = np.empty((1, len(pairs), 3), dtype=np.uint8)
+    for i, (mx, mn) in enumerate(pairs):
+        bgr[0, i] = (mx, mn, mn)
+    return bgr
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")
+def test_saturation_mask_matches_cvtcolor():
+    bgr = _all_max_min_pairs()
+    saturation = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)[:, :, 1]
+    out = np.empty(bgr.shape[:2], dtype=np.uint8)
+    expected = np.empty_like(out)
+
+    for threshold in range(256):
+        saturation_threshold_mask(bgr, threshold, -1, 0, out)
+        cv2.threshold(saturation, threshold, 255, cv2.THRESH_BINARY, dst=expected)
+        assert np.array_equal(out, expected), f"mismatch at threshold {threshold}"
+
+
+def test_locked_color_info_keeps_method_and_threshold():
+    lower, upper = get_hsv_bounds((60.0, 200.0, 150.0), False)
+    info = locked_color_detection_info("#1e9650", lower, upper)
+
+    assert info["method"] == "Locked Color"
+    assert info["threshold"] == "H:50-70 S:130-255 V:80-220"
+    assert info["target_color"] == "#1e9650"